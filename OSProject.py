@@ -2,158 +2,669 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import psutil
 import random
+import heapq
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left, bisect_right, insort
 from time import time
 
-class SimpleMemoryAllocator:
+# Free blocks are indexed by size as one int, size << ADDRESS_BITS | start,
+# so the index holds no tuples and orders by size, then address
+ADDRESS_BITS = 32
+ADDRESS_MASK = (1 << ADDRESS_BITS) - 1
+
+def random_operations(count, rng=random):
+    """Pre-draw the coin flips, allocation sizes and free picks for a test run"""
+    return ([rng.random() for _ in range(count)],
+            rng.choices(range(10, 101), k=count),
+            [rng.random() for _ in range(count)])
+
+class MemoryAllocator:
+    """Bookkeeping and evaluation shared by the allocation strategies"""
+    algorithms = ()
+    # Id slots from which begin_snapshot() journals operations instead of
+    # copying the state; None always copies. Copying is cheaper on small
+    # heaps, since 20 operations take longer to replay than to copy a few
+    # short lists.
+    journal_threshold = 8192
+
     def __init__(self, total_memory=1024):
         self.total = total_memory
-        self.free_blocks = [(0, total_memory)]
-        self.allocations = {}
-        self.next_id = 1
-        self.best_algorithm = 'best'  # Default to best-fit
-        self.algorithm_stats = {'best': {'fragmentation': 0, 'tests': 0},
-                               'worst': {'fragmentation': 0, 'tests': 0}}
+        # Allocation slots indexed by id; ids start at 1 so slot 0 is unused
+        self.alloc_starts = [0]
+        self.alloc_sizes = [0]
+        self.alloc_pos = [-1]  # Position of each id in alloc_ids, -1 if free
+        # Live ids in a list so a random one can be picked without copying
+        self.alloc_ids = []
+        self.free_ids = []  # Released ids, reused before new slots are added
+        self.used_bytes = 0
+        self._journal = None  # Operations recorded since begin_snapshot()
+        self._snapshot = None  # Or the state it copied
+        self.best_algorithm = self.algorithms[0]
+        self.algorithm_stats = {name: {'fragmentation': 0, 'tests': 0, 'average': 0}
+                                for name in self.algorithms}
 
-    def allocate(self, size, algorithm='best'):
-        if algorithm == 'best':
-            best = None
-            for i, (start, block_size) in enumerate(self.free_blocks):
-                if block_size >= size and (best is None or block_size < best[1]):
-                    best = (i, start, block_size)
-        else:
-            best = None
-            for i, (start, block_size) in enumerate(self.free_blocks):
-                if block_size >= size and (best is None or block_size > best[2]):
-                    best = (i, start, block_size)
+    @property
+    def best_algorithm(self):
+        return self._best_algorithm
 
-        if not best:
-            return None
+    @best_algorithm.setter
+    def best_algorithm(self, algorithm):
+        # Bind the matching allocation routine once, so allocate_selected
+        # does not dispatch on the algorithm name for every call
+        self._best_algorithm = algorithm
+        self.allocate_selected = self._fit(algorithm)
 
-        i, start, block_size = best
-        self.free_blocks.pop(i)
-        
-        remaining = block_size - size
-        if remaining > 0:
-            self.free_blocks.append((start + size, remaining))
-        
-        alloc_id = self.next_id
-        self.allocations[alloc_id] = (start, size)
-        self.next_id += 1
+    def _fit(self, algorithm):
+        """Return a callable that allocates a size with the given algorithm"""
+        return self.allocate
+
+    def is_allocated(self, alloc_id):
+        return 0 < alloc_id < len(self.alloc_pos) and self.alloc_pos[alloc_id] >= 0
+
+    def chunk_size(self, alloc_id):
+        """Bytes reserved for an allocation, which may exceed the size requested"""
+        return self.alloc_sizes[alloc_id]
+
+    def _register(self, start, size):
+        reused = bool(self.free_ids)
+        if reused:
+            alloc_id = self.free_ids.pop()
+            self.alloc_starts[alloc_id] = start
+            self.alloc_sizes[alloc_id] = size
+        else:
+            alloc_id = len(self.alloc_starts)
+            self.alloc_starts.append(start)
+            self.alloc_sizes.append(size)
+            self.alloc_pos.append(-1)
+        self.alloc_pos[alloc_id] = len(self.alloc_ids)
+        self.alloc_ids.append(alloc_id)
+        self.used_bytes += size
+        if self._journal is not None:
+            self._journal.append(('alloc', alloc_id, reused))
         return alloc_id
 
+    def _unregister(self, alloc_id):
+        # Move the last id into the freed position so removal is O(1)
+        i = self.alloc_pos[alloc_id]
+        last = self.alloc_ids.pop()
+        if last != alloc_id:
+            self.alloc_ids[i] = last
+            self.alloc_pos[last] = i
+        self.alloc_pos[alloc_id] = -1
+        self.free_ids.append(alloc_id)
+        start = self.alloc_starts[alloc_id]
+        size = self.alloc_sizes[alloc_id]
+        self.used_bytes -= size
+        if self._journal is not None:
+            self._journal.append(('free', alloc_id, start, size))
+        return start, size
+
     def free(self, alloc_id):
-        if alloc_id not in self.allocations:
+        if not self.is_allocated(alloc_id):
             return False
-            
-        start, size = self.allocations.pop(alloc_id)
-        self.free_blocks.append((start, size))
-        self._merge_blocks()
+
+        start, size = self._unregister(alloc_id)
+        self._release(start, size)
         return True
 
-    def _merge_blocks(self):
-        if not self.free_blocks:
+    def begin_snapshot(self):
+        """Save the state, or start a journal of allocate/free calls, for rollback()"""
+        if self.journal_threshold is not None and len(self.alloc_starts) >= self.journal_threshold:
+            self._journal = []
+        else:
+            self._snapshot = (self._save_bookkeeping(), self._save_free_state())
+
+    def rollback(self):
+        """Undo every operation since begin_snapshot()"""
+        if self._journal is None:
+            bookkeeping, free_state = self._snapshot
+            self._restore_bookkeeping(bookkeeping)
+            self._restore_free_state(free_state)
+            self._snapshot = None
             return
-            
-        self.free_blocks.sort()
-        merged = [self.free_blocks[0]]
-        
-        for current in self.free_blocks[1:]:
-            last = merged[-1]
-            if last[0] + last[1] == current[0]:
-                merged[-1] = (last[0], last[1] + current[1])
+
+        # Replay the journal newest first
+        journal, self._journal = self._journal, None
+        for entry in reversed(journal):
+            if entry[0] == 'alloc':
+                _, alloc_id, reused = entry
+                self._release(*self._unregister(alloc_id))
+                if not reused:
+                    # The id was a new slot; drop it rather than keep it for reuse
+                    self.free_ids.pop()
+                    del self.alloc_starts[-1], self.alloc_sizes[-1], self.alloc_pos[-1]
             else:
-                merged.append(current)
-                
-        self.free_blocks = merged
+                _, alloc_id, start, size = entry
+                self._claim(start, size)
+                self.free_ids.pop()
+                self.alloc_starts[alloc_id] = start
+                self.alloc_sizes[alloc_id] = size
+                self.alloc_pos[alloc_id] = len(self.alloc_ids)
+                self.alloc_ids.append(alloc_id)
+                self.used_bytes += size
+
+    def _save_bookkeeping(self):
+        return (self.alloc_starts.copy(), self.alloc_sizes.copy(),
+                self.alloc_pos.copy(), self.alloc_ids.copy(), self.free_ids.copy(),
+                self.used_bytes)
+
+    def _restore_bookkeeping(self, state):
+        (self.alloc_starts, self.alloc_sizes, self.alloc_pos,
+         self.alloc_ids, self.free_ids, self.used_bytes) = state
 
     def get_stats(self):
-        used = sum(size for _, size in self.allocations.values())
-        free = sum(size for _, size in self.free_blocks)
-        fragmentation = len(self.free_blocks) - 1 if len(self.free_blocks) > 1 else 0
+        # Every figure is kept up to date by allocate/free, so this is O(1)
+        fragments = self.n_free_blocks
+        fragmentation = fragments - 1 if fragments > 1 else 0
         return {
             'total': self.total,
-            'used': used,
-            'free': free,
-            'fragments': len(self.free_blocks),
-            'allocations': len(self.allocations),
+            'used': self.used_bytes,
+            'free': self.free_bytes,
+            # Rounding slack inside allocated chunks
+            'internal': self.total - self.used_bytes - self.free_bytes,
+            'fragments': fragments,
+            'allocations': len(self.alloc_ids),
             'fragmentation': fragmentation
         }
 
-    def evaluate_algorithm(self, algorithm):
-        """Run a test and evaluate the algorithm's performance"""
-        # Save current state
-        original_allocations = self.allocations.copy()
-        original_free_blocks = self.free_blocks.copy()
-        original_next_id = self.next_id
-        
-        # Run test allocations
-        test_results = {'success': 0, 'failed': 0, 'total_fragmentation': 0}
+    def clone(self):
+        """Independent copy, e.g. for evaluating on another thread"""
+        return copy.deepcopy(self)
+
+    def evaluate_algorithm(self, algorithm, trials=1, rng=random):
+        """Run test workloads and evaluate the algorithm's performance"""
+        # Attribute lookups are hoisted into locals since this loop runs
+        # for every evaluation.
+        allocate = self._fit(algorithm)
+        free = self.free
+        get_stats = self.get_stats
+        success = failed = total_fragmentation = 0
         operations = 0
         
-        for _ in range(20):  # Perform 20 operations (mix of alloc/free)
-            if random.random() < 0.7 or not self.allocations:
-                # Try to allocate
-                size = random.randint(10, 100)
-                if self.allocate(size, algorithm):
-                    test_results['success'] += 1
+        for _ in range(trials):
+            # Snapshot so the test operations can be undone afterwards
+            self.begin_snapshot()
+            alloc_ids = self.alloc_ids
+            
+            # Perform 20 operations (mix of alloc/free)
+            coins, sizes, picks = random_operations(20, rng)
+            for coin, size, pick in zip(coins, sizes, picks):
+                if coin < 0.7 or not alloc_ids:
+                    # Try to allocate
+                    if allocate(size) is not None:
+                        success += 1
+                    else:
+                        failed += 1
                 else:
-                    test_results['failed'] += 1
-            else:
-                # Free a random allocation
-                id = random.choice(list(self.allocations.keys()))
-                self.free(id)
+                    # Free a random allocation
+                    free(alloc_ids[int(pick * len(alloc_ids))])
+                
+                total_fragmentation += get_stats()['fragmentation']
+                operations += 1
             
-            stats = self.get_stats()
-            test_results['total_fragmentation'] += stats['fragmentation']
-            operations += 1
+            # Restore original state
+            self.rollback()
         
         # Calculate average fragmentation
         if operations > 0:
-            avg_fragmentation = test_results['total_fragmentation'] / operations
+            avg_fragmentation = total_fragmentation / operations
         else:
             avg_fragmentation = 0
         
-        # Restore original state
-        self.allocations = original_allocations
-        self.free_blocks = original_free_blocks
-        self.next_id = original_next_id
-        self._merge_blocks()
-        
         return {
-            'success_rate': test_results['success'] / (test_results['success'] + test_results['failed']) if (test_results['success'] + test_results['failed']) > 0 else 0,
+            'success_rate': success / (success + failed) if (success + failed) > 0 else 0,
             'avg_fragmentation': avg_fragmentation
         }
 
-    def determine_best_algorithm(self):
+    def determine_best_algorithm(self, trials=1, rng=random):
         """Determine which algorithm performs better"""
-        best_stats = self.evaluate_algorithm('best')
-        worst_stats = self.evaluate_algorithm('worst')
-        
-        # Update algorithm statistics
-        self.algorithm_stats['best']['fragmentation'] += best_stats['avg_fragmentation']
-        self.algorithm_stats['best']['tests'] += 1
-        self.algorithm_stats['worst']['fragmentation'] += worst_stats['avg_fragmentation']
-        self.algorithm_stats['worst']['tests'] += 1
-        
-        # Determine which is better (lower fragmentation is better)
-        best_avg = self.algorithm_stats['best']['fragmentation'] / self.algorithm_stats['best']['tests'] if self.algorithm_stats['best']['tests'] > 0 else 0
-        worst_avg = self.algorithm_stats['worst']['fragmentation'] / self.algorithm_stats['worst']['tests'] if self.algorithm_stats['worst']['tests'] > 0 else 0
-        
-        if best_avg <= worst_avg:
-            self.best_algorithm = 'best'
-        else:
-            self.best_algorithm = 'worst'
+        return self.record_evaluation({name: self.evaluate_algorithm(name, trials, rng)
+                                       for name in self.algorithms})
+
+    def record_evaluation(self, results):
+        """Fold evaluate_algorithm results into the running averages and pick the best"""
+        for name, stats in results.items():
+            totals = self.algorithm_stats[name]
+            totals['fragmentation'] += stats['avg_fragmentation']
+            totals['tests'] += 1
+            totals['average'] = totals['fragmentation'] / totals['tests']
+        
+        # Lower fragmentation is better; ties go to the first algorithm
+        self.best_algorithm = min(self.algorithm_stats,
+                                  key=lambda name: self.algorithm_stats[name]['average'])
         
         return self.best_algorithm, {
-            'best_fragmentation': best_avg,
-            'worst_fragmentation': worst_avg
+            f'{name}_fragmentation': totals['average']
+            for name, totals in self.algorithm_stats.items()
         }
 
+class SimpleMemoryAllocator(MemoryAllocator):
+    algorithms = ('best', 'worst')
+
+    def __init__(self, total_memory=1024):
+        super().__init__(total_memory)
+        # Free blocks as parallel arrays, sorted by start address
+        self.free_starts = [0]
+        self.free_sizes = [total_memory]
+        self.free_by_size = [total_memory << ADDRESS_BITS]  # Packed, sorted
+
+    @property
+    def free_blocks(self):
+        return list(zip(self.free_starts, self.free_sizes))
+
+    def allocate(self, size, algorithm='best'):
+        if algorithm == 'best':
+            return self._allocate_best(size)
+        return self._allocate_worst(size)
+
+    def _fit(self, algorithm):
+        return self._allocate_best if algorithm == 'best' else self._allocate_worst
+
+    def _allocate_best(self, size):
+        # Smallest block that fits, lowest address on ties
+        j = bisect_left(self.free_by_size, size << ADDRESS_BITS)
+        if j == len(self.free_by_size):
+            return None
+        return self._take(j, size)
+
+    def _allocate_worst(self, size):
+        # Largest block, lowest address on ties
+        if not self.free_by_size:
+            return None
+        largest = self.free_by_size[-1] >> ADDRESS_BITS
+        if largest < size:
+            return None
+        return self._take(bisect_left(self.free_by_size, largest << ADDRESS_BITS), size)
+
+    def _take(self, j, size):
+        """Allocate from the front of the block at position j of free_by_size"""
+        key = self.free_by_size.pop(j)
+        block_size = key >> ADDRESS_BITS
+        start = key & ADDRESS_MASK
+        i = bisect_left(self.free_starts, start)
+
+        remaining = block_size - size
+        if remaining > 0:
+            self.free_starts[i] = start + size
+            self.free_sizes[i] = remaining
+            insort(self.free_by_size, remaining << ADDRESS_BITS | start + size)
+        else:
+            del self.free_starts[i]
+            del self.free_sizes[i]
+
+        return self._register(start, size)
+
+    def _release(self, start, size):
+        starts = self.free_starts
+        sizes = self.free_sizes
+
+        # Coalesce with the neighbours on either side of the insertion point
+        i = bisect_left(starts, start)
+        if i < len(starts) and start + size == starts[i]:
+            self._remove_size_entry(sizes[i], starts[i])
+            size += sizes[i]
+            del starts[i]
+            del sizes[i]
+        if i > 0 and starts[i - 1] + sizes[i - 1] == start:
+            i -= 1
+            self._remove_size_entry(sizes[i], starts[i])
+            start = starts[i]
+            size += sizes[i]
+            starts[i] = start
+            sizes[i] = size
+        else:
+            starts.insert(i, start)
+            sizes.insert(i, size)
+
+        insort(self.free_by_size, size << ADDRESS_BITS | start)
+
+    def _claim(self, start, size):
+        # Carve an exact range back out of the free block that contains it
+        starts = self.free_starts
+        sizes = self.free_sizes
+        i = bisect_right(starts, start) - 1
+        block_start, block_size = starts[i], sizes[i]
+        self._remove_size_entry(block_size, block_start)
+
+        pieces = []
+        if start > block_start:
+            pieces.append((block_start, start - block_start))
+        if start + size < block_start + block_size:
+            pieces.append((start + size, block_start + block_size - start - size))
+        starts[i:i + 1] = [piece_start for piece_start, _ in pieces]
+        sizes[i:i + 1] = [piece_size for _, piece_size in pieces]
+        for piece_start, piece_size in pieces:
+            insort(self.free_by_size, piece_size << ADDRESS_BITS | piece_start)
+
+    def _remove_size_entry(self, size, start):
+        del self.free_by_size[bisect_left(self.free_by_size, size << ADDRESS_BITS | start)]
+
+    def _save_free_state(self):
+        return self.free_starts.copy(), self.free_sizes.copy(), self.free_by_size.copy()
+
+    def _restore_free_state(self, state):
+        self.free_starts, self.free_sizes, self.free_by_size = state
+
+    @property
+    def free_bytes(self):
+        return self.total - self.used_bytes
+
+    @property
+    def n_free_blocks(self):
+        return len(self.free_starts)
+
+class BuddyMemoryAllocator(MemoryAllocator):
+    """Buddy system: blocks are powers of two and merge with their buddy"""
+    algorithms = ('buddy',)
+    journal_threshold = 2048  # Its free sets are slower to copy than lists
+
+    def __init__(self, total_memory=1024):
+        # Only the largest power-of-two region of the heap is managed
+        self.max_order = total_memory.bit_length() - 1
+        super().__init__(1 << self.max_order)
+        # Start addresses of the free blocks of each order (size 2**order)
+        self.free_lists = [set() for _ in range(self.max_order + 1)]
+        self.free_lists[self.max_order].add(0)
+        self.free_bytes = self.total
+        self.n_free_blocks = 1
+
+    @property
+    def free_blocks(self):
+        return sorted((start, 1 << order)
+                      for order, starts in enumerate(self.free_lists)
+                      for start in starts)
+
+    @staticmethod
+    def _order(size):
+        return max(size - 1, 0).bit_length()
+
+    def chunk_size(self, alloc_id):
+        return 1 << self._order(self.alloc_sizes[alloc_id])
+
+    def allocate(self, size, algorithm='buddy'):
+        order = self._order(size)
+        for k in range(order, self.max_order + 1):
+            if self.free_lists[k]:
+                break
+        else:
+            return None
+
+        # Split the block down to the requested order, freeing the upper halves
+        start = self.free_lists[k].pop()
+        self.free_bytes -= 1 << order
+        self.n_free_blocks += k - order - 1
+        while k > order:
+            k -= 1
+            self.free_lists[k].add(start + (1 << k))
+
+        return self._register(start, size)
+
+    def _release(self, start, size):
+        order = self._order(size)
+        self.free_bytes += 1 << order
+        self.n_free_blocks += 1
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            if buddy not in self.free_lists[order]:
+                break
+            self.free_lists[order].remove(buddy)
+            self.n_free_blocks -= 1
+            start &= ~(1 << order)
+            order += 1
+
+        self.free_lists[order].add(start)
+
+    def _claim(self, start, size):
+        # Find the free block containing start and split it down around it
+        order = self._order(size)
+        k = order
+        block = start
+        while block not in self.free_lists[k]:
+            k += 1
+            block &= ~((1 << k) - 1)
+        self.free_lists[k].remove(block)
+        self.free_bytes -= 1 << order
+        self.n_free_blocks += k - order - 1
+        while k > order:
+            k -= 1
+            half = block + (1 << k)
+            if start >= half:
+                self.free_lists[k].add(block)
+                block = half
+            else:
+                self.free_lists[k].add(half)
+
+    def _save_free_state(self):
+        return [starts.copy() for starts in self.free_lists], self.free_bytes, self.n_free_blocks
+
+    def _restore_free_state(self, state):
+        self.free_lists, self.free_bytes, self.n_free_blocks = state
+
+
+class SegregatedMemoryAllocator(MemoryAllocator):
+    """Segregated fit: free chunks are binned by size class and coalesced on free"""
+    algorithms = ('segregated',)
+    min_class = 16
+    # The journal records requested sizes, not the chunk each request was
+    # carved into, so this allocator always copies its state
+    journal_threshold = None
+
+    def __init__(self, total_memory=1024):
+        super().__init__(total_memory)
+        self.bins = {}  # size class -> start addresses of free chunks
+        self.bin_classes = []  # Sorted classes whose bins are non-empty
+        self.free_addrs = []  # Start addresses of free chunks, sorted
+        self.chunk_sizes = {}  # start -> size of every chunk, free or in use
+        self.top = 0  # Memory above this address has never been handed out
+        self.free_bytes = self.total
+        self.n_free_blocks = 1  # The untouched region counts while non-empty
+
+    @classmethod
+    def size_class(cls, size):
+        """Smallest class >= size; four classes per doubling (20, 24, 28, 32, 40...)"""
+        if size <= cls.min_class:
+            return cls.min_class
+        shift = (size - 1).bit_length() - 3
+        return (((size - 1) >> shift) + 1) << shift
+
+    @classmethod
+    def bin_class(cls, size):
+        """Largest class <= size, i.e. the bin a free chunk of this size goes in"""
+        shift = size.bit_length() - 3
+        return (size >> shift) << shift
+
+    @property
+    def free_blocks(self):
+        blocks = [(start, self.chunk_sizes[start]) for start in self.free_addrs]
+        if self.top < self.total:
+            blocks.append((self.top, self.total - self.top))
+        return blocks
+
+    def allocate(self, size, algorithm='segregated'):
+        size_class = self.size_class(size)
+        if self.bins.get(size_class):
+            start, chunk = self._take_chunk(size_class)
+        elif self.top + size_class <= self.total:
+            start = self.top
+            chunk = size_class
+            self.top += size_class
+            self.free_bytes -= size_class
+            if self.top == self.total:
+                self.n_free_blocks -= 1
+        else:
+            # Split the smallest chunk from a larger class
+            j = bisect_right(self.bin_classes, size_class)
+            if j == len(self.bin_classes):
+                return None
+            start, chunk = self._take_chunk(self.bin_classes[j])
+            if chunk - size_class >= self.min_class:
+                self._push_chunk(start + size_class, chunk - size_class)
+                chunk = size_class
+
+        self.chunk_sizes[start] = chunk
+        return self._register(start, size)
+
+    def chunk_size(self, alloc_id):
+        return self.chunk_sizes[self.alloc_starts[alloc_id]]
+
+    def _release(self, start, size):
+        size = self.chunk_sizes.pop(start)
+
+        # Merge with free neighbours found through the address index
+        addrs = self.free_addrs
+        i = bisect_left(addrs, start)
+        if i < len(addrs) and addrs[i] == start + size:
+            size += self._remove_chunk(addrs[i])
+        if i > 0 and addrs[i - 1] + self.chunk_sizes[addrs[i - 1]] == start:
+            start = addrs[i - 1]
+            size += self._remove_chunk(start)
+
+        if start + size == self.top:
+            # Hand the space back to the untouched region
+            if self.top == self.total:
+                self.n_free_blocks += 1
+            self.top = start
+            self.free_bytes += size
+        else:
+            self._push_chunk(start, size)
+
+    def _take_chunk(self, size_class):
+        start = next(iter(self.bins[size_class]))
+        return start, self._remove_chunk(start)
+
+    def _remove_chunk(self, start):
+        """Drop a free chunk from its bin and the address index; return its size"""
+        size = self.chunk_sizes.pop(start)
+        size_class = self.bin_class(size)
+        starts = self.bins[size_class]
+        starts.remove(start)
+        if not starts:
+            del self.bins[size_class]
+            del self.bin_classes[bisect_left(self.bin_classes, size_class)]
+        del self.free_addrs[bisect_left(self.free_addrs, start)]
+        self.free_bytes -= size
+        self.n_free_blocks -= 1
+        return size
+
+    def _push_chunk(self, start, size):
+        self.chunk_sizes[start] = size
+        self.free_bytes += size
+        self.n_free_blocks += 1
+        size_class = self.bin_class(size)
+        if size_class not in self.bins:
+            self.bins[size_class] = set()
+            insort(self.bin_classes, size_class)
+        self.bins[size_class].add(start)
+        insort(self.free_addrs, start)
+
+    def _save_free_state(self):
+        return ({c: starts.copy() for c, starts in self.bins.items()},
+                self.bin_classes.copy(), self.free_addrs.copy(),
+                self.chunk_sizes.copy(), self.top,
+                self.free_bytes, self.n_free_blocks)
+
+    def _restore_free_state(self, state):
+        (self.bins, self.bin_classes, self.free_addrs, self.chunk_sizes,
+         self.top, self.free_bytes, self.n_free_blocks) = state
+
+class BitmapMemoryAllocator(MemoryAllocator):
+    """First fit over a bitmap of 8-byte units; bit i set means unit i is free"""
+    algorithms = ('bitmap',)
+    unit = 8
+
+    def __init__(self, total_memory=1024):
+        self.units = total_memory // self.unit
+        super().__init__(self.units * self.unit)
+        self.bitmap = (1 << self.units) - 1
+        self.free_bytes = self.total
+        self.n_free_blocks = 1
+
+    @classmethod
+    def _units(cls, size):
+        return max((size + cls.unit - 1) // cls.unit, 1)
+
+    @property
+    def free_blocks(self):
+        blocks = []
+        bits = self.bitmap
+        while bits:
+            low = (bits & -bits).bit_length() - 1
+            # Adding 1 to a run of ones carries to just past its end
+            run = bits >> low
+            length = ((run + 1) & -(run + 1)).bit_length() - 1
+            blocks.append((low * self.unit, length * self.unit))
+            bits &= ~(((1 << length) - 1) << low)
+        return blocks
+
+    def allocate(self, size, algorithm='bitmap'):
+        units = self._units(size)
+
+        # Bit i of runs stays set while units i .. i+span-1 are all free
+        runs = self.bitmap
+        span = 1
+        while span * 2 <= units:
+            runs &= runs >> span
+            span *= 2
+        if span < units:
+            runs &= runs >> (units - span)
+        if not runs:
+            return None
+
+        first = (runs & -runs).bit_length() - 1
+        self._take_units(first, units)
+        return self._register(first * self.unit, size)
+
+    def chunk_size(self, alloc_id):
+        return self._units(self.alloc_sizes[alloc_id]) * self.unit
+
+    def _free_neighbours(self, first, units):
+        """How many of the units just before and after a run are free"""
+        left = first > 0 and self.bitmap >> (first - 1) & 1
+        return left + (self.bitmap >> (first + units) & 1)
+
+    def _take_units(self, first, units):
+        # Taking a run out of a free block leaves 0, 1 or 2 pieces of it
+        self.n_free_blocks += self._free_neighbours(first, units) - 1
+        self.free_bytes -= units * self.unit
+        self.bitmap &= ~(((1 << units) - 1) << first)
+
+    def _release(self, start, size):
+        first = start // self.unit
+        units = self._units(size)
+        self.n_free_blocks += 1 - self._free_neighbours(first, units)
+        self.free_bytes += units * self.unit
+        self.bitmap |= ((1 << units) - 1) << first
+
+    def _claim(self, start, size):
+        self._take_units(start // self.unit, self._units(size))
+
+    def _save_free_state(self):
+        return self.bitmap, self.free_bytes, self.n_free_blocks
+
+    def _restore_free_state(self, state):
+        self.bitmap, self.free_bytes, self.n_free_blocks = state
+
+ALGORITHM_NAMES = {'best': 'Best-Fit', 'worst': 'Worst-Fit', 'buddy': 'Buddy',
+                   'segregated': 'Segregated', 'bitmap': 'Bitmap'}
+ALLOCATOR_TYPES = {name: allocator_type
+                   for allocator_type in (SimpleMemoryAllocator, BuddyMemoryAllocator,
+                                          SegregatedMemoryAllocator, BitmapMemoryAllocator)
+                   for name in allocator_type.algorithms}
+
+# Test runs averaged per algorithm by the Evaluate Algorithms button
+EVALUATION_TRIALS = 100
+
 class SimplePerformanceApp:
     def __init__(self, root):
         self.root = root
         root.title("Smart Memory Allocator")
         root.geometry("800x600")
+        root.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Evaluations run off the Tk thread; results are polled with after()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._evaluation = None
         
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill='both', expand=True)
@@ -179,6 +690,7 @@ class SimplePerformanceApp:
         self.process_tree.heading('name', text='Process')
         self.process_tree.heading('memory', text='Memory (MB)')
         self.process_tree.pack(fill='both', expand=True)
+        self.process_rows = {}  # pid -> Treeview item id
 
     def create_memory_tab(self):
         tab = ttk.Frame(self.notebook)
@@ -191,8 +703,9 @@ class SimplePerformanceApp:
         
         ttk.Label(control_frame, text="Algorithm:").pack(side='left')
         self.algorithm = tk.StringVar(value='best')
-        ttk.Radiobutton(control_frame, text="Best-Fit", variable=self.algorithm, value='best').pack(side='left')
-        ttk.Radiobutton(control_frame, text="Worst-Fit", variable=self.algorithm, value='worst').pack(side='left')
+        for name, label in ALGORITHM_NAMES.items():
+            ttk.Radiobutton(control_frame, text=label, variable=self.algorithm, value=name,
+                            command=self.select_algorithm).pack(side='left')
         
         ttk.Button(control_frame, text="Auto Test", command=self.run_test).pack(side='right')
         ttk.Button(control_frame, text="Evaluate Algorithms", command=self.evaluate_algorithms).pack(side='right', padx=5)
@@ -202,6 +715,11 @@ class SimplePerformanceApp:
         
         self.mem_canvas = tk.Canvas(tab, bg='white', height=100)
         self.mem_canvas.pack(fill='x', pady=10)
+        # Canvas items already drawn, so update_memory only touches changes
+        self._free_items = {}  # (start, size) -> rectangle id
+        self._alloc_items = {}  # alloc id -> (rectangle id, text id, (start, size))
+        self._canvas_scale = None
+        self._test_job = None  # Pending after() id of a running Auto Test
         
         self.stats_label = ttk.Label(tab, text="")
         self.stats_label.pack()
@@ -226,47 +744,124 @@ class SimplePerformanceApp:
         ram = psutil.virtual_memory()
         self.ram_label.config(text=f"{ram.used//(1024**2)} MB / {ram.total//(1024**2)} MB ({ram.percent}%)")
         
-        for row in self.process_tree.get_children():
-            self.process_tree.delete(row)
+        top = heapq.nlargest(10, psutil.process_iter(['name', 'memory_info']),
+                             key=lambda p: p.info['memory_info'].rss if p.info['memory_info'] else 0)
         
-        for proc in sorted(psutil.process_iter(['name', 'memory_info']), 
-                          key=lambda p: p.info['memory_info'].rss, 
-                          reverse=True)[:10]:
+        # Update rows in place; only processes entering or leaving the
+        # top 10 create or destroy Treeview items
+        rows = {}
+        for proc in top:
             try:
-                mem = proc.info['memory_info'].rss // (1024**2)
-                self.process_tree.insert('', 'end', values=(proc.info['name'], mem))
+                values = (proc.info['name'], proc.info['memory_info'].rss // (1024**2))
             except:
                 continue
+            iid = self.process_rows.get(proc.pid)
+            if iid is None:
+                iid = self.process_tree.insert('', len(rows), values=values)
+            else:
+                self.process_tree.item(iid, values=values)
+                self.process_tree.move(iid, '', len(rows))
+            rows[proc.pid] = iid
+        
+        for pid, iid in self.process_rows.items():
+            if pid not in rows:
+                self.process_tree.delete(iid)
+        self.process_rows = rows
         
-        self.root.after(1000, self.update_system)
+        self.root.after(2000, self.update_system)
 
     def update_memory(self):
-        self.mem_canvas.delete('all')
+        canvas = self.mem_canvas
         stats = self.allocator.get_stats()
         
-        width = self.mem_canvas.winfo_width()
+        width = canvas.winfo_width()
         scale = width / stats['total']
-        
-        for start, size in self.allocator.free_blocks:
+        if scale != self._canvas_scale:
+            # Every item moves when the width changes, so redraw from scratch
+            canvas.delete('all')
+            self._free_items = {}
+            self._alloc_items = {}
+            self._canvas_scale = scale
+        
+        # Keep rectangles for unchanged free blocks and move stale ones
+        # onto new blocks before creating anything
+        free_items = {}
+        new_blocks = []
+        for block in self.allocator.free_blocks:
+            if block in self._free_items:
+                free_items[block] = self._free_items.pop(block)
+            else:
+                new_blocks.append(block)
+        stale = list(self._free_items.values())
+        for start, size in new_blocks:
             x1 = start * scale
             x2 = (start + size) * scale
-            self.mem_canvas.create_rectangle(x1, 0, x2, 50, fill='lightgreen', outline='black')
-        
-        for id, (start, size) in self.allocator.allocations.items():
+            if stale:
+                rect = stale.pop()
+                canvas.coords(rect, x1, 0, x2, 50)
+            else:
+                rect = canvas.create_rectangle(x1, 0, x2, 50, fill='lightgreen', outline='black', tags='free')
+            free_items[(start, size)] = rect
+        if stale:
+            canvas.delete(*stale)
+        if new_blocks:
+            # New or moved free rectangles must stay under allocation labels
+            canvas.tag_lower('free')
+        self._free_items = free_items
+        
+        alloc_items = {}
+        redrawn = False
+        alloc_starts = self.allocator.alloc_starts
+        chunk_size = self.allocator.chunk_size
+        for id in self.allocator.alloc_ids:
+            # Draw the whole reserved chunk so rounding slack is not shown as a gap
+            start = alloc_starts[id]
+            size = chunk_size(id)
             x1 = start * scale
             x2 = (start + size) * scale
-            self.mem_canvas.create_rectangle(x1, 0, x2, 50, fill='lightcoral', outline='black')
-            self.mem_canvas.create_text((x1+x2)/2, 25, text=str(id))
+            item = self._alloc_items.pop(id, None)
+            if item is None:
+                rect = canvas.create_rectangle(x1, 0, x2, 50, fill='lightcoral', outline='black')
+                text = canvas.create_text((x1+x2)/2, 25, text=str(id), tags='label')
+                redrawn = True
+            else:
+                rect, text, block = item
+                if block != (start, size):
+                    canvas.coords(rect, x1, 0, x2, 50)
+                    canvas.coords(text, (x1+x2)/2, 25)
+                    redrawn = True
+            alloc_items[id] = (rect, text, (start, size))
+        for rect, text, _ in self._alloc_items.values():
+            canvas.delete(rect, text)
+        if redrawn:
+            # A new rectangle can overlap a narrow neighbour's label
+            canvas.tag_raise('label')
+        self._alloc_items = alloc_items
         
         self.stats_label.config(text=(
             f"Total: {stats['total']} | Used: {stats['used']} | "
-            f"Free: {stats['free']} | Fragments: {stats['fragments']} | "
-            f"Algorithm: {'Best-Fit' if self.allocator.best_algorithm == 'best' else 'Worst-Fit'}"
+            f"Free: {stats['free']} | Internal: {stats['internal']} | "
+            f"Fragments: {stats['fragments']} | "
+            f"Algorithm: {ALGORITHM_NAMES[self.allocator.best_algorithm]}"
         ))
         self.algorithm_info.config(
-            text=f"Current: {'Best-Fit' if self.allocator.best_algorithm == 'best' else 'Worst-Fit'}"
+            text=f"Current: {ALGORITHM_NAMES[self.allocator.best_algorithm]}"
         )
 
+    def select_algorithm(self):
+        algorithm = self.algorithm.get()
+        allocator_type = ALLOCATOR_TYPES[algorithm]
+        if not isinstance(self.allocator, allocator_type):
+            # Different allocator families cannot share a heap layout
+            if self.allocator.alloc_ids and not messagebox.askyesno(
+                    "Switch Allocator",
+                    f"Switching to {ALGORITHM_NAMES[algorithm]} frees all current allocations. Continue?"):
+                self.algorithm.set(self.allocator.best_algorithm)
+                return
+            self.allocator = allocator_type(self.allocator.total)
+        self.allocator.best_algorithm = algorithm
+        self.update_memory()
+
     def do_allocate(self):
         try:
             size = int(self.size_entry.get())
@@ -277,8 +872,8 @@ class SimplePerformanceApp:
             return
             
         # Use the determined best algorithm
-        id = self.allocator.allocate(size, self.allocator.best_algorithm)
-        if not id:
+        id = self.allocator.allocate_selected(size)
+        if id is None:
             messagebox.showerror("Error", "Not enough memory")
         else:
             self.update_memory()
@@ -296,28 +891,75 @@ class SimplePerformanceApp:
             self.update_memory()
 
     def run_test(self):
-        for _ in range(10):
-            if random.random() < 0.7 or not self.allocator.allocations:
-                size = random.randint(10, 100)
-                self.allocator.allocate(size, self.allocator.best_algorithm)
-            else:
-                id = random.choice(list(self.allocator.allocations.keys()))
-                self.allocator.free(id)
-            
-            self.update_memory()
-            self.root.update()
-            self.root.after(500)
+        # Restart rather than interleave if a test is already running
+        if self._test_job is not None:
+            self.root.after_cancel(self._test_job)
+        self._run_test_step(0, random_operations(10))
+
+    def _run_test_step(self, step, operations):
+        """Perform one Auto Test operation and schedule the next in 500 ms"""
+        coins, sizes, picks = operations
+        alloc_ids = self.allocator.alloc_ids
+        if coins[step] < 0.7 or not alloc_ids:
+            self.allocator.allocate_selected(sizes[step])
+        else:
+            self.allocator.free(alloc_ids[int(picks[step] * len(alloc_ids))])
+        
+        self.update_memory()
+        if step + 1 < len(coins):
+            self._test_job = self.root.after(500, self._run_test_step, step + 1, operations)
+        else:
+            self._test_job = None
 
     def evaluate_algorithms(self):
-        """Evaluate both algorithms and select the best one"""
-        best_algo, stats = self.allocator.determine_best_algorithm()
+        """Evaluate the available algorithms in the background"""
+        if self._evaluation is not None:
+            return
+        
+        # Workers get their own allocator copy and Random instance, so
+        # nothing they touch is shared with the GUI or with each other
+        allocator = self.allocator
+        current = {name: self.executor.submit(allocator.clone().evaluate_algorithm, name,
+                                              EVALUATION_TRIALS, random.Random())
+                   for name in allocator.algorithms}
+        
+        # Other allocator families are evaluated on a fresh heap of the same size
+        others = {name: self.executor.submit(allocator_type(allocator.total).evaluate_algorithm,
+                                             name, EVALUATION_TRIALS, random.Random())
+                  for name, allocator_type in ALLOCATOR_TYPES.items()
+                  if not isinstance(allocator, allocator_type)}
+        
+        self._evaluation = (allocator, current, others)
+        self.root.after(50, self._check_evaluation)
+
+    def _check_evaluation(self):
+        allocator, current, others = self._evaluation
+        if not all(job.done() for job in (*current.values(), *others.values())):
+            self.root.after(50, self._check_evaluation)
+            return
+        self._evaluation = None
+        
+        best_algo, stats = allocator.record_evaluation(
+            {name: job.result() for name, job in current.items()})
+        lines = [f"{ALGORITHM_NAMES[name]} Average Fragmentation: {stats[name + '_fragmentation']:.2f}"
+                 for name in allocator.algorithms]
+        for name, job in others.items():
+            lines.append(f"{ALGORITHM_NAMES[name]} Average Fragmentation (empty heap): "
+                         f"{job.result()['avg_fragmentation']:.2f}")
+        
         messagebox.showinfo("Algorithm Evaluation",
-            f"Algorithm Evaluation Results:\n\n"
-            f"Best-Fit Average Fragmentation: {stats['best_fragmentation']:.2f}\n"
-            f"Worst-Fit Average Fragmentation: {stats['worst_fragmentation']:.2f}\n\n"
-            f"Selected Algorithm: {'Best-Fit' if best_algo == 'best' else 'Worst-Fit'}"
+            f"Algorithm Evaluation Results:\n\n" +
+            "\n".join(lines) + "\n\n" +
+            f"Selected Algorithm: {ALGORITHM_NAMES[best_algo]}"
         )
-        self.update_memory()
+        # The user may have switched allocators while the workers ran
+        if allocator is self.allocator:
+            self.algorithm.set(best_algo)
+            self.update_memory()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
 if __name__ == "__main__":
     root = tk.Tk()